@@ -22,12 +22,29 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
+import math
+import sys
 import cv2
 import numpy as np
 from pathlib import Path
 from typing import List, Optional, Dict, Tuple, Union
 from sift_detector import SIFTDetector6DoF
 
+# WGS84 equatorial radius
+EARTH_RADIUS = 6378137.0  # meters
+
+# Half-angle tolerance (radians) within which quaternion_to_euler_NED()
+# treats pitch as ±90°; roll and yaw are not separable there
+GIMBAL_LOCK_TOLERANCE = 1e-3
+
+# Static header printed before every detection report
+RESULTS_HEADER = "\n".join([
+    "\nGP-Tag Detection Results:",
+    "-" * 50,
+    "Using NED (North-East-Down) coordinate frame",
+    "Reference pose: tag flat on ground (z-down), right side facing north"
+])
+
 def create_visualization(original_image: np.ndarray, 
                         corners: List[List[float]], 
                         rectified_image: np.ndarray,
@@ -56,8 +73,24 @@ def create_visualization(original_image: np.ndarray,
         - Blue dots mark exact corner positions
         - Both images are labeled for clear identification
     """
-    # Create copy of original image for drawing
-    detection_vis = original_image.copy()
+    height, width = original_image.shape[:2]
+    
+    # Convert rectified image to BGR if it's grayscale
+    if len(rectified_image.shape) == 2:
+        rectified_vis = cv2.cvtColor(rectified_image, cv2.COLOR_GRAY2BGR)
+    else:
+        rectified_vis = rectified_image
+    
+    # Allocate the combined output once and fill both halves in place
+    scale_factor = height / rectified_vis.shape[0]
+    new_width = int(rectified_vis.shape[1] * scale_factor)
+    combined_vis = np.empty((height, width + new_width, 3), dtype=np.uint8)
+    detection_vis = combined_vis[:, :width]
+    np.copyto(detection_vis, original_image)
+    
+    # Resize rectified image to match height of original, directly into the right half
+    cv2.resize(rectified_vis, (new_width, height), dst=combined_vis[:, width:])
+    rectified_vis = combined_vis[:, width:]
     
     # Convert corners to integer points and numpy array
     corners = np.array(corners, dtype=np.int32)
@@ -65,35 +98,28 @@ def create_visualization(original_image: np.ndarray,
     # Draw boundary box
     cv2.polylines(detection_vis, [corners], True, (0, 255, 0), 2)
     
-    # Add corner numbers (clockwise from top-left)
-    for i, corner in enumerate(corners):
-        cv2.circle(detection_vis, tuple(corner), 5, (255, 0, 0), -1)
-        cv2.putText(detection_vis, str(i), tuple(corner + 10),
+    # Mark all corners in one call; zero-length segments of thickness 10 are
+    # drawn as filled dots identical to cv2.circle with radius 5
+    corner_dots = np.repeat(corners[:, np.newaxis, :], 2, axis=1)
+    cv2.polylines(detection_vis, list(corner_dots), False, (255, 0, 0), 10)
+    
+    # Add corner numbers (clockwise from top-left); label origins are kept as
+    # separate x/y lists of Python ints so no per-corner array rows are built
+    label_xs = (corners[:, 0] + 10).tolist()
+    label_ys = (corners[:, 1] + 10).tolist()
+    for i in range(len(label_xs)):
+        cv2.putText(detection_vis, str(i), (label_xs[i], label_ys[i]),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 0, 0), 2)
     
-    # Convert rectified image to BGR if it's grayscale
-    if len(rectified_image.shape) == 2:
-        rectified_vis = cv2.cvtColor(rectified_image, cv2.COLOR_GRAY2BGR)
-    else:
-        rectified_vis = rectified_image.copy()
-    
-    # Resize rectified image to match height of original
-    scale_factor = detection_vis.shape[0] / rectified_vis.shape[0]
-    new_width = int(rectified_vis.shape[1] * scale_factor)
-    rectified_vis = cv2.resize(rectified_vis, (new_width, detection_vis.shape[0]))
-    
     # Add labels
     cv2.putText(detection_vis, "Original Detection", (10, 30),
                 cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
     cv2.putText(rectified_vis, "Rectified Tag", (10, 30),
                 cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
     
-    # Combine images horizontally
-    combined_vis = np.hstack([detection_vis, rectified_vis])
-    
     return combined_vis
 
-def quaternion_to_euler_NED(q: List[float]) -> List[float]:
+def quaternion_to_euler_NED(q: Union[List[float], np.ndarray]) -> Union[List[float], np.ndarray]:
     """
     Convert quaternion to Euler angles following NED (North-East-Down) convention.
     
@@ -112,40 +138,77 @@ def quaternion_to_euler_NED(q: List[float]) -> List[float]:
     - Tag's top pointing East
     
     Args:
-        q: Quaternion as [x,y,z,w]
+        q: Quaternion as [x,y,z,w], or an (N,4) array of quaternions
         
     Returns:
-        List of Euler angles [roll, pitch, yaw] in degrees, NED convention
+        List of Euler angles [roll, pitch, yaw] in degrees, NED convention.
+        For an (N,4) input, an (N,3) array of angles is returned instead.
         
     Notes:
         - Angles are returned in degrees
         - Pitch is negated to follow NED convention
-        - Gimbal lock is handled for pitch near ±90°
+        - Gimbal lock is handled for pitch near ±90°: within
+          GIMBAL_LOCK_TOLERANCE, roll is set to 0 and yaw carries the
+          whole rotation about the vertical
+        - Roll and yaw are wrapped to (-180°, 180°]
+        - Uses the direct quaternion to Euler method of Bernardes and
+          Viollet, without an intermediate rotation matrix; it is scale
+          invariant, so quaternions need not be unit length
+        - Single quaternions use the math module, which is considerably
+          cheaper than NumPy on scalars
     """
-    x, y, z, w = q
+    q = np.asarray(q, dtype=np.float64)
     
-    # Roll (x-axis rotation)
-    sinr_cosp = 2 * (w * x + y * z)
-    cosr_cosp = 1 - 2 * (x * x + y * y)
-    roll = np.arctan2(sinr_cosp, cosr_cosp)
-
-    # Pitch (y-axis rotation)
-    sinp = 2 * (w * y - z * x)
-    if abs(sinp) >= 1:
-        pitch = np.sign(sinp) * np.pi / 2
-    else:
-        pitch = np.arcsin(sinp)
-
-    # Yaw (z-axis rotation)
-    siny_cosp = 2 * (w * z + x * y)
-    cosy_cosp = 1 - 2 * (y * y + z * z)
-    yaw = np.arctan2(siny_cosp, cosy_cosp)
-
-    return [
-        np.degrees(roll),
-        np.degrees(-pitch),  # Negate pitch for NED frame
-        np.degrees(yaw)
-    ]
+    if q.ndim == 1:
+        # Same method as the batch path below, so the result does not
+        # depend on whether a quaternion arrives alone or in a batch
+        x, y, z, w = q.tolist()
+        a, b, c, d = w - y, x + z, w + y, z - x
+        
+        theta_plus = math.atan2(b, a)
+        theta_minus = math.atan2(d, c)
+        half = math.atan2(math.hypot(c, d), math.hypot(a, b))
+        pitch = 2 * half - math.pi / 2
+        
+        # Gimbal lock: only roll + yaw (or yaw - roll) is defined, put it all in yaw
+        if half < GIMBAL_LOCK_TOLERANCE:
+            roll, yaw = 0.0, 2 * theta_plus
+        elif half > math.pi / 2 - GIMBAL_LOCK_TOLERANCE:
+            roll, yaw = 0.0, 2 * theta_minus
+        else:
+            roll, yaw = theta_plus - theta_minus, theta_plus + theta_minus
+        
+        # Negate pitch for NED frame, wrap to (-180, 180]
+        return [math.degrees(math.pi - (math.pi - angle) % (2 * math.pi))
+                for angle in (roll, -pitch, yaw)]
+    
+    x, y, z, w = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+    
+    # Extrinsic X-Y-Z sequence (equivalent to intrinsic Z-Y'-X'')
+    a = w - y
+    b = x + z
+    c = w + y
+    d = z - x
+    
+    theta_plus = np.arctan2(b, a)
+    theta_minus = np.arctan2(d, c)
+    
+    # Middle angle from the magnitudes
+    half = np.arctan2(np.hypot(c, d), np.hypot(a, b))
+    pitch = 2 * half - np.pi / 2
+    
+    # Gimbal lock: only roll + yaw (or yaw - roll) is defined, put it all in yaw
+    lock_plus = half < GIMBAL_LOCK_TOLERANCE
+    lock_minus = half > np.pi / 2 - GIMBAL_LOCK_TOLERANCE
+    locked = lock_plus | lock_minus
+    roll = np.where(locked, 0.0, theta_plus - theta_minus)
+    yaw = np.where(lock_plus, 2 * theta_plus,
+                   np.where(lock_minus, 2 * theta_minus, theta_plus + theta_minus))
+    
+    euler = np.stack([roll, -pitch, yaw], axis=-1)  # Negate pitch for NED frame
+    euler = np.pi - (np.pi - euler) % (2 * np.pi)  # Wrap to (-180, 180]
+    
+    return np.degrees(euler)
 
 def calculate_observer_position(tag_position: List[float], 
                               tag_lat: float, 
@@ -176,15 +239,12 @@ def calculate_observer_position(tag_position: List[float],
             - Z axis points Down
         - Calculations are approximate for small distances (<10km)
     """
-    # WGS84 equatorial radius
-    EARTH_RADIUS = 6378137.0  # meters
-    
     # Extract NED components
     n, e, d = tag_position
     
     # Calculate changes in latitude and longitude
-    lat_change = np.degrees(n / EARTH_RADIUS)
-    lon_change = np.degrees(e / (EARTH_RADIUS * np.cos(np.radians(tag_lat))))
+    lat_change = math.degrees(n / EARTH_RADIUS)
+    lon_change = math.degrees(e / (EARTH_RADIUS * math.cos(math.radians(tag_lat))))
     
     # Calculate observer position
     obs_lat = tag_lat - lat_change  # Subtract because tag position is relative to observer
@@ -193,6 +253,84 @@ def calculate_observer_position(tag_position: List[float],
     
     return obs_lat, obs_lon, obs_alt
 
+# Compiled numba kernel; None until first use, False if numba is missing
+_observer_kernel = None
+
+def _get_observer_kernel():
+    """
+    Compile the numba observer kernel on first use.
+    
+    numba is optional and imported here rather than at module load, so it
+    costs nothing unless batches are processed.
+    
+    Returns:
+        The compiled kernel, or None if numba is not installed
+    """
+    global _observer_kernel
+    if _observer_kernel is None:
+        try:
+            import numba
+        except ImportError:
+            _observer_kernel = False
+            return None
+        
+        @numba.njit(parallel=True, fastmath=True, cache=True)
+        def observer_positions(north, east, down, tag_lats, tag_lons, tag_alts):
+            count = north.shape[0]
+            obs_lats = np.empty(count)
+            obs_lons = np.empty(count)
+            obs_alts = np.empty(count)
+            for i in numba.prange(count):
+                obs_lats[i] = tag_lats[i] - math.degrees(north[i] / EARTH_RADIUS)
+                obs_lons[i] = tag_lons[i] - math.degrees(
+                    east[i] / (EARTH_RADIUS * math.cos(math.radians(tag_lats[i]))))
+                obs_alts[i] = tag_alts[i] + down[i]
+            return obs_lats, obs_lons, obs_alts
+        
+        _observer_kernel = observer_positions
+    return _observer_kernel or None
+
+def calculate_observer_positions(tag_positions: np.ndarray,
+                                 tag_lats: Union[float, np.ndarray],
+                                 tag_lons: Union[float, np.ndarray],
+                                 tag_alts: Union[float, np.ndarray]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calculate observer global positions for a batch of detections.
+    
+    Vectorized counterpart of calculate_observer_position() for processing
+    many detections at once, e.g. one per video frame.
+    
+    Args:
+        tag_positions: (N,3) array of [north, east, down] position vectors in meters
+        tag_lats: (N,) tag latitudes in degrees, or one latitude for all
+        tag_lons: (N,) tag longitudes in degrees, or one longitude for all
+        tag_alts: (N,) tag altitudes in meters, or one altitude for all
+        
+    Returns:
+        Tuple of (latitudes, longitudes, altitudes) arrays of shape (N,)
+        
+    Notes:
+        - Same flat Earth approximation as calculate_observer_position()
+        - Uses a parallel numba kernel when numba is installed, otherwise NumPy;
+          both accept the same inputs and return the same shapes
+    """
+    tag_positions = np.asarray(tag_positions, dtype=np.float64)
+    count = tag_positions.shape[0]
+    n, e, d = (np.ascontiguousarray(tag_positions[:, i]) for i in range(3))
+    tag_lats, tag_lons, tag_alts = (
+        np.ascontiguousarray(np.broadcast_to(np.asarray(values, dtype=np.float64), (count,)))
+        for values in (tag_lats, tag_lons, tag_alts)
+    )
+    
+    kernel = _get_observer_kernel()
+    if kernel is not None:
+        return kernel(n, e, d, tag_lats, tag_lons, tag_alts)
+    
+    lat_change = np.rad2deg(n / EARTH_RADIUS)
+    lon_change = np.rad2deg(e / (EARTH_RADIUS * np.cos(np.deg2rad(tag_lats))))
+    
+    return tag_lats - lat_change, tag_lons - lon_change, tag_alts + d
+
 def print_detection_results(results: Dict) -> None:
     """
     Print GP-Tag detection results in a human-readable format using NED frame conventions.
@@ -218,51 +356,47 @@ def print_detection_results(results: Dict) -> None:
         - Positions are in meters
         - NED frame is used consistently throughout
     """
-    print("\nGP-Tag Detection Results:")
-    print("-" * 50)
-    print("Using NED (North-East-Down) coordinate frame")
-    print("Reference pose: tag flat on ground (z-down), right side facing north")
-    
     if not results:
-        print("No tag detected.")
+        sys.stdout.write(RESULTS_HEADER + "\nNo tag detected.\n")
         return
         
-    print(f"Detection Time: {results['detection_time_ms']:.1f}ms")
+    parts = [RESULTS_HEADER]
+    parts.append(f"Detection Time: {results['detection_time_ms']:.1f}ms")
     
     if results.get('tag_data'):
         tag_data = results['tag_data']
-        print("\nTag Data:")
-        print(f"  Tag ID: {tag_data['tag_id']}")
-        print(f"  Version: {tag_data['version_id']}")
+        parts.append("\nTag Data:")
+        parts.append(f"  Tag ID: {tag_data['tag_id']}")
+        parts.append(f"  Version: {tag_data['version_id']}")
         
-        print(f"\nTag Global Position (NED frame):")
-        print(f"  Latitude:  {tag_data['latitude']:.6f}°")
-        print(f"  Longitude: {tag_data['longitude']:.6f}°")
-        print(f"  Altitude:  {tag_data['altitude']:.1f}m")
+        parts.append(f"\nTag Global Position (NED frame):")
+        parts.append(f"  Latitude:  {tag_data['latitude']:.6f}°")
+        parts.append(f"  Longitude: {tag_data['longitude']:.6f}°")
+        parts.append(f"  Altitude:  {tag_data['altitude']:.1f}m")
         
-        print("\nTag Orientation (NED frame):")
-        print("  Quaternion [x,y,z,w]:")
-        print(f"    [{', '.join([f'{x:.3f}' for x in tag_data['quaternion']])}]")
+        parts.append("\nTag Orientation (NED frame):")
+        parts.append("  Quaternion [x,y,z,w]:")
+        parts.append(f"    [{', '.join([f'{x:.3f}' for x in tag_data['quaternion']])}]")
         
         euler = quaternion_to_euler_NED(tag_data['quaternion'])
-        print("  Euler angles [roll, pitch, yaw] (degrees):")
-        print(f"    [{', '.join([f'{x:.1f}°' for x in euler])}]")
-        print("    (pitch is negative in NED frame)")
+        parts.append("  Euler angles [roll, pitch, yaw] (degrees):")
+        parts.append(f"    [{', '.join([f'{x:.1f}°' for x in euler])}]")
+        parts.append("    (pitch is negative in NED frame)")
         
-        print(f"\nTag Metadata:")
-        print(f"  Accuracy:  Level {tag_data['accuracy']}")
-        print(f"  Scale:     {tag_data['scale']:.3f} cells/mm")
+        parts.append(f"\nTag Metadata:")
+        parts.append(f"  Accuracy:  Level {tag_data['accuracy']}")
+        parts.append(f"  Scale:     {tag_data['scale']:.3f} cells/mm")
         
-    print("\nCamera-Tag Relative Pose (NED frame):")
-    print(f"  Position [north, east, down]:")
-    print(f"    [{', '.join([f'{x:.3f}m' for x in results['position']])}]")
-    print(f"  Rotation quaternion [x,y,z,w]:")
-    print(f"    [{', '.join([f'{x:.3f}' for x in results['rotation']])}]")
+    parts.append("\nCamera-Tag Relative Pose (NED frame):")
+    parts.append(f"  Position [north, east, down]:")
+    parts.append(f"    [{', '.join([f'{x:.3f}m' for x in results['position']])}]")
+    parts.append(f"  Rotation quaternion [x,y,z,w]:")
+    parts.append(f"    [{', '.join([f'{x:.3f}' for x in results['rotation']])}]")
     
     cam_euler = quaternion_to_euler_NED(results['rotation'])
-    print("  Rotation Euler [roll, pitch, yaw] (degrees):")
-    print(f"    [{', '.join([f'{x:.1f}°' for x in cam_euler])}]")
-    print("    (pitch is negative in NED frame)")
+    parts.append("  Rotation Euler [roll, pitch, yaw] (degrees):")
+    parts.append(f"    [{', '.join([f'{x:.1f}°' for x in cam_euler])}]")
+    parts.append("    (pitch is negative in NED frame)")
     
     if results.get('tag_data'):
         obs_lat, obs_lon, obs_alt = calculate_observer_position(
@@ -271,15 +405,18 @@ def print_detection_results(results: Dict) -> None:
             tag_data['longitude'],
             tag_data['altitude']
         )
-        print("\nObserver Global Position:")
-        print(f"  Latitude:  {obs_lat:.6f}°")
-        print(f"  Longitude: {obs_lon:.6f}°")
-        print(f"  Altitude:  {obs_alt:.1f}m")
+        parts.append("\nObserver Global Position:")
+        parts.append(f"  Latitude:  {obs_lat:.6f}°")
+        parts.append(f"  Longitude: {obs_lon:.6f}°")
+        parts.append(f"  Altitude:  {obs_alt:.1f}m")
     
     if results.get('timing_stats'):
-        print("\nTiming Breakdown:")
+        parts.append("\nTiming Breakdown:")
         for stage, time in results['timing_stats'].items():
-            print(f"  {stage}: {time:.1f}ms")
+            parts.append(f"  {stage}: {time:.1f}ms")
+    
+    # Emit the whole report with a single write
+    sys.stdout.write("\n".join(parts) + "\n")
 
 def main() -> None:
     """
@@ -313,6 +450,9 @@ def main() -> None:
         print(f"Error: Example image not found at {image_path}")
         return
         
+    # Decode once as BGR; the detector converts to grayscale itself and the
+    # same decode is reused for the visualization. IMREAD_GRAYSCALE is not
+    # used because libpng's RGB to gray rounding differs from cv2.cvtColor.
     image = cv2.imread(str(image_path))
     if image is None:
         print("Error: Failed to load image")
@@ -324,10 +464,12 @@ def main() -> None:
         [0, 961.267, 538.868],
         [0, 0, 1]
     ])
-    dist_coeffs = np.zeros(5)  # Assuming no distortion for demo
+    dist_coeffs = None  # Assuming no distortion for demo
 
-    # Initialize detector
+    # Initialize detector; OpenCL offload of the wide warp is opt-in
+    # (SIFTDetector6DoF(use_opencl=True)) and left off here
     detector = SIFTDetector6DoF()
+    detector.warmup()
 
     try:
         # Run detection
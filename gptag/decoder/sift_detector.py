@@ -33,6 +33,59 @@ from data_decoder import decode_data
 from spike_detector import SpikeDetector
 from finder_decoder import FinderDecoder
 
+def build_rectification_maps(H: np.ndarray,
+                             dst_size: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Builds remap lookup tables equivalent to cv2.warpPerspective with H.
+    
+    The homography is passed as the rectification transform of
+    cv2.initUndistortRectifyMap with identity camera matrices and no
+    distortion, which yields the same source coordinates warpPerspective
+    computes internally. The maps can then be reused with cv2.remap for
+    every frame that shares the same homography.
+    
+    Args:
+        H: 3x3 homography mapping source image to destination image
+        dst_size: (width, height) of the rectified output
+        
+    Returns:
+        Tuple of (mapx, mapy) in fixed-point CV_16SC2 format for cv2.remap
+    """
+    identity = np.eye(3)
+    return cv2.initUndistortRectifyMap(identity, None, np.asarray(H, dtype=np.float64),
+                                       identity, tuple(dst_size), cv2.CV_16SC2)
+
+def rectify_batch(frames: List[np.ndarray],
+                  H: np.ndarray,
+                  dst_size: Tuple[int, int]) -> np.ndarray:
+    """
+    Warps several grayscale frames that share one homography.
+    
+    One, three or four frames are stacked as channels of a single image so
+    that cv2.warpPerspective computes the source coordinates once for all of
+    them. Other batch sizes are warped frame by frame into a pre-allocated
+    output: OpenCV's interpolation is slower beyond four channels, and its
+    two-channel path rounds differently from the single-channel one.
+    
+    Args:
+        frames: Sequence of equally sized single-channel images
+        H: 3x3 homography mapping source image to destination image
+        dst_size: (width, height) of the rectified output
+        
+    Returns:
+        Array of shape (N, height, width) with the rectified frames
+    """
+    width, height = dst_size
+    if len(frames) in (1, 3, 4):
+        stacked = np.stack(frames, axis=-1)
+        warped = cv2.warpPerspective(stacked, H, (width, height))
+        return np.moveaxis(warped.reshape(height, width, len(frames)), -1, 0)
+
+    rectified = np.empty((len(frames), height, width), dtype=frames[0].dtype)
+    for i, frame in enumerate(frames):
+        cv2.warpPerspective(frame, H, (width, height), dst=rectified[i])
+    return rectified
+
 class SIFTDetector6DoF:
     """
     A tag detector that estimates 6-DoF pose using SIFT features and homography matching.
@@ -51,25 +104,109 @@ class SIFTDetector6DoF:
         matcher: FLANN-based feature matcher configured with:
             - 5 randomized kd-trees for feature organization
             - 50 checks per search for match quality
+        use_opencl: Whether the wide rectification warp runs on OpenCL
+            through cv2.UMat
     """
 
-    def __init__(self):
+    # Number of homographies whose remap tables are kept by rectify()
+    MAX_CACHED_MAPS = 8
+
+    def __init__(self, use_opencl: bool = False):
         """
         Initializes SIFT detector and FLANN matcher.
         
         Uses FLANN matcher with randomized kd-trees for efficient feature matching:
         - 5 trees for feature organization
         - 50 checks per search balances speed and match quality
+        
+        Args:
+            use_opencl: Run the wide rectification warp through OpenCV's
+                transparent API (cv2.UMat). SIFT itself always runs on the
+                CPU, since OpenCV's SIFT reads its input back to host memory.
+                Ignored when no OpenCL device is available. The process-wide
+                cv2.ocl.setUseOpenCL() setting is left as the caller set it.
         """
+        self.use_opencl = use_opencl and cv2.ocl.haveOpenCL()
         self.sift = cv2.SIFT_create()
         self.matcher = cv2.FlannBasedMatcher(
             dict(algorithm=1, trees=5),
             dict(checks=50)
         )
+        self._rectification_maps = {}
+        self._template = None
+        self._template_features = None
+
+    def warmup(self) -> None:
+        """
+        Pays the one-time setup costs before the first real frame.
+        
+        Loads the template and computes its SIFT features, which every
+        detect() call reuses afterwards. With use_opencl set, one small
+        device warp also builds the OpenCL warp kernel. SIFT is not run on
+        a dummy frame: its cost is per call, so that would only add time.
+        
+        Raises:
+            ValueError: If the template image tag3_blank_360.png isn't found
+        """
+        self._get_template_features()
+        if self.use_opencl:
+            blank = np.zeros((360, 360), dtype=np.uint8)
+            cv2.warpPerspective(cv2.UMat(blank), np.eye(3), (360, 360)).get()
+
+    def _get_template_features(self) -> Tuple[np.ndarray, List[cv2.KeyPoint], Optional[np.ndarray]]:
+        """
+        Loads the template image and its SIFT features once per detector.
+        
+        Returns:
+            Tuple of (template image, keypoints, descriptors)
+            
+        Raises:
+            ValueError: If the template image tag3_blank_360.png isn't found
+        """
+        if self._template is None:
+            template_path = Path(__file__).parent / "tag3_blank_360.png"
+            template = cv2.imread(str(template_path), cv2.IMREAD_GRAYSCALE)
+            if template is None:
+                raise ValueError(f"Could not load template image at {template_path}")
+            self._template_features = self.sift.detectAndCompute(template, None)
+            self._template = template
+        kp, des = self._template_features
+        return self._template, kp, des
+
+    def rectify(self, image: np.ndarray,
+                H: np.ndarray,
+                dst_size: Tuple[int, int]) -> np.ndarray:
+        """
+        Warps an image with a homography, reusing cached remap tables.
+        
+        Intended for streams where the homography stays fixed between frames,
+        e.g. a static camera observing a static tag. The remap tables are
+        built once per (H, dst_size) and every later frame only pays for
+        cv2.remap. Up to MAX_CACHED_MAPS homographies are cached, the oldest
+        entry is evicted first.
+        
+        Args:
+            image: Source image (grayscale or BGR)
+            H: 3x3 homography mapping source image to destination image
+            dst_size: (width, height) of the rectified output
+            
+        Returns:
+            Rectified image, identical to cv2.warpPerspective(image, H, dst_size)
+            up to fixed-point interpolation rounding
+        """
+        H = np.asarray(H, dtype=np.float64)
+        key = (H.tobytes(), tuple(dst_size))
+        maps = self._rectification_maps.get(key)
+        if maps is None:
+            if len(self._rectification_maps) >= self.MAX_CACHED_MAPS:
+                self._rectification_maps.pop(next(iter(self._rectification_maps)))
+            maps = build_rectification_maps(H, dst_size)
+            self._rectification_maps[key] = maps
+        return cv2.remap(image, maps[0], maps[1], cv2.INTER_LINEAR)
 
     def detect(self, image: np.ndarray, 
                camera_matrix: np.ndarray, 
-               dist_coeffs: np.ndarray, 
+               dist_coeffs: Optional[np.ndarray] = None, 
                debug_info: bool = False,
                save_imgs: bool = False,
                debug_directory: Optional[str] = None) -> Optional[Dict]:
@@ -79,7 +216,9 @@ class SIFTDetector6DoF:
         Args:
             image: Input image (grayscale or BGR)
             camera_matrix: 3x3 camera intrinsic matrix
-            dist_coeffs: Camera distortion coefficients
+            dist_coeffs: Camera distortion coefficients, or None for an
+                undistorted camera. Pose is currently recovered from the
+                homography alone, so keypoints are not undistorted.
             debug_info: Whether to include extra debug data in results
             save_imgs: Whether to save debug visualizations
             debug_directory: Output directory for debug images
@@ -112,21 +251,17 @@ class SIFTDetector6DoF:
         total_start_time = time.time()
         timing_stats = {}
         
-        # Convert to grayscale if needed
+        # Convert to grayscale if needed; grayscale input is only read, never modified
         if len(image.shape) > 2:
             gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         else:
-            gray = image.copy()
+            gray = image
 
-        # Load template
-        template_path = Path(__file__).parent / "tag3_blank_360.png"
-        template = cv2.imread(str(template_path), cv2.IMREAD_GRAYSCALE)
-        if template is None:
-            raise ValueError(f"Could not load template image at {template_path}")
+        # Template and its SIFT features are loaded once and cached
+        template, kp1, des1 = self._get_template_features()
 
         # Initial SIFT detection
         sift_start = time.time()
-        kp1, des1 = self.sift.detectAndCompute(template, None)
         kp2, des2 = self.sift.detectAndCompute(gray, None)
         
         if save_imgs and debug_directory:
@@ -206,7 +341,11 @@ class SIFTDetector6DoF:
             ], dtype=np.float32)
             
             H_rect = cv2.getPerspectiveTransform(padded_corners, dst_corners)
-            rectified_wide = cv2.warpPerspective(gray, H_rect, target_size)
+            # Only this warp is offloaded; SIFT above runs on the CPU either way
+            gray_src = cv2.UMat(gray) if self.use_opencl else gray
+            rectified_wide = cv2.warpPerspective(gray_src, H_rect, target_size)
+            if isinstance(rectified_wide, cv2.UMat):
+                rectified_wide = rectified_wide.get()
             
             timing_stats['initial_pose'] = (time.time() - pose_start) * 1000
 
@@ -227,7 +366,7 @@ class SIFTDetector6DoF:
 
             # Run refinement SIFT on the wider rectified image
             refine_start = time.time()
-            kp_template_refine, des_template_refine = self.sift.detectAndCompute(template, None)
+            kp_template_refine, des_template_refine = kp1, des1
             kp_wide_refine, des_wide_refine = self.sift.detectAndCompute(rectified_wide, None)
 
             if save_imgs and debug_directory:
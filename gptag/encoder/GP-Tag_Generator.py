@@ -28,7 +28,9 @@ from PIL import Image, ImageTk
 import os
 import sys
 import math
-from tag_encoder import create_fiducial_marker
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from tag_encoder import create_fiducial_marker, create_marker_base
 
 def euler_to_quaternion(roll, pitch, yaw):
     """
@@ -45,31 +47,49 @@ def euler_to_quaternion(roll, pitch, yaw):
     - Bottom points East (+Y)
     - Tag face is UP (visible when looking down)
     
+    Scalar inputs use the math module directly. Array inputs are stacked so
+    that all half-angle sines and cosines are computed in one NumPy call each.
+    
     Args:
-        roll (float): Rotation around X (North) axis in degrees
-        pitch (float): Rotation around Y (East) axis in degrees
-        yaw (float): Rotation around Z (Down) axis in degrees
+        roll (float or array-like): Rotation around X (North) axis in degrees
+        pitch (float or array-like): Rotation around Y (East) axis in degrees
+        yaw (float or array-like): Rotation around Z (Down) axis in degrees
     
     Returns:
-        list: Quaternion [qx, qy, qz, qw]
+        list: Quaternion [qx, qy, qz, qw] for scalar inputs, or
+        np.ndarray: Array of shape (..., 4) for array inputs
     """
-    roll = math.radians(roll)
-    pitch = math.radians(pitch)
-    yaw = math.radians(yaw)
-    
-    cy = math.cos(yaw * 0.5)
-    sy = math.sin(yaw * 0.5)
-    cp = math.cos(pitch * 0.5)
-    sp = math.sin(pitch * 0.5)
-    cr = math.cos(roll * 0.5)
-    sr = math.sin(roll * 0.5)
+    if all(isinstance(angle, (int, float)) for angle in (roll, pitch, yaw)):
+        roll = math.radians(roll) * 0.5
+        pitch = math.radians(pitch) * 0.5
+        yaw = math.radians(yaw) * 0.5
+        
+        cy = math.cos(yaw)
+        sy = math.sin(yaw)
+        cp = math.cos(pitch)
+        sp = math.sin(pitch)
+        cr = math.cos(roll)
+        sr = math.sin(roll)
+        
+        qw = cr * cp * cy + sr * sp * sy
+        qx = sr * cp * cy - cr * sp * sy
+        qy = cr * sp * cy + sr * cp * sy
+        qz = cr * cp * sy - sr * sp * cy
+        
+        return [qx, qy, qz, qw]
     
-    qw = cr * cp * cy + sr * sp * sy
-    qx = sr * cp * cy - cr * sp * sy
-    qy = cr * sp * cy + sr * cp * sy
-    qz = cr * cp * sy - sr * sp * cy
+    half = 0.5 * np.deg2rad(np.stack(np.broadcast_arrays(roll, pitch, yaw), axis=-1))
+    s = np.sin(half)
+    c = np.cos(half)
+    sr, sp, sy = s[..., 0], s[..., 1], s[..., 2]
+    cr, cp, cy = c[..., 0], c[..., 1], c[..., 2]
     
-    return [qx, qy, qz, qw]
+    return np.stack([
+        sr * cp * cy - cr * sp * sy,
+        cr * sp * cy + sr * cp * sy,
+        cr * cp * sy - sr * sp * cy,
+        cr * cp * cy + sr * sp * sy
+    ], axis=-1)
 
 class GPTagGeneratorGUI:
     """
@@ -101,6 +121,11 @@ class GPTagGeneratorGUI:
         U (tk.IntVar): Base unit size in pixels
         save_path (tk.StringVar): Directory path for saving generated tags
         current_image (PIL.Image): Currently generated GP-Tag image
+        preview_params (tuple): Parameter values used for the current image
+        base_U (int): Base unit size the cached base_image was built for
+        base_image (PIL.Image): Cached tag template without data cells
+        executor (ThreadPoolExecutor): Single worker used for tag generation
+        pending_render (tuple): (params, Future) of the latest queued generation
     """
     
     def __init__(self, root):
@@ -122,6 +147,15 @@ class GPTagGeneratorGUI:
         
         self.save_path = tk.StringVar(value=os.getcwd())
         self.current_image = None
+        self.preview_params = None
+        
+        # Tag generation runs on a single background worker
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.pending_render = None
+        
+        # Payload-independent tag template, rebuilt only when U changes
+        self.base_U = self.U.get()
+        self.base_image = create_marker_base(U=self.base_U)
         
         self.create_widgets()
         
@@ -289,37 +323,119 @@ class GPTagGeneratorGUI:
         """
         Generate a GP-Tag with current parameter values.
         
-        Converts Euler angles to quaternion, generates the tag image,
-        and displays preview in the GUI canvas.
+        Reads the parameters on the Tk thread and hands tag generation to a
+        background worker so the window stays responsive. Only the latest
+        request is kept: a queued generation that has not started yet is
+        dropped when a new one arrives. Clicking Generate again with
+        unchanged parameters keeps the existing tag and preview.
         
         Handles errors with message dialogs.
         """
         try:
-            quaternion = euler_to_quaternion(
-                self.roll.get(),
-                self.pitch.get(),
-                self.yaw.get()
-            )
-            # Tag size in mm -> scale cells/mm
-            tag_size_mm = self.scale.get()  
-            calculated_scale = 36 / tag_size_mm 
-
-            self.current_image = create_fiducial_marker(
+            params = (
                 self.latitude.get(),
                 self.longitude.get(),
                 self.altitude.get(),
-                quaternion,
-                calculated_scale,
+                self.roll.get(),
+                self.pitch.get(),
+                self.yaw.get(),
+                self.scale.get(),
                 self.accuracy.get(),
                 self.tag_id.get(),
                 self.version_id.get(),
-                U=self.U.get()
+                self.U.get()
             )
+        except Exception as e:
+            messagebox.showerror("Error", f"Error generating tag: {str(e)}")
+            return
+        
+        # Supersede any queued or running generation before the shortcut
+        # below, so returning to the displayed parameters discards it
+        if self.pending_render is not None:
+            if params == self.pending_render[0]:
+                return
+            self.pending_render[1].cancel()
+            self.pending_render = None
+
+        if self.current_image and params == self.preview_params:
+            return
+
+        future = self.executor.submit(self.render_tag, params)
+        self.pending_render = (params, future)
+        self.root.after(30, self.poll_render, future)
+
+    def render_tag(self, params):
+        """
+        Build the tag and its preview image; runs on the worker thread.
+        
+        Args:
+            params (tuple): Parameter values as collected by generate_tag
+        
+        Returns:
+            tuple: (tag image or None, preview image or None)
+        """
+        latitude, longitude, altitude, roll, pitch, yaw, tag_size_mm, accuracy, tag_id, version_id, U = params
+        quaternion = euler_to_quaternion(roll, pitch, yaw)
+        # Tag size in mm -> scale cells/mm
+        calculated_scale = 36 / tag_size_mm 
+
+        # Only the single worker thread touches the cached base
+        if U != self.base_U:
+            self.base_image = create_marker_base(U=U)
+            self.base_U = U
+
+        tag_image = create_fiducial_marker(
+            latitude,
+            longitude,
+            altitude,
+            quaternion,
+            calculated_scale,
+            accuracy,
+            tag_id,
+            version_id,
+            U=U,
+            base_image=self.base_image
+        )
+        if not tag_image:
+            return None, None
+        
+        display_size = 400
+        if max(tag_image.size) <= display_size:
+            display_image = tag_image
+        else:
+            # Preview only; the saved tag keeps its full resolution. Nearest
+            # neighbour striding is enough for the black/white tag cells.
+            step = math.ceil(max(tag_image.size) / display_size)
+            pixels = np.asarray(tag_image, dtype=np.uint8)
+            display_image = Image.fromarray(pixels[::step, ::step])
+        
+        return tag_image, display_image
+
+    def poll_render(self, future):
+        """
+        Show the result of a background generation once it is finished.
+        
+        Re-schedules itself on the Tk event loop until the worker is done.
+        Results of superseded generations are discarded.
+        
+        Args:
+            future (concurrent.futures.Future): Pending render_tag call
+        """
+        if not future.done():
+            self.root.after(30, self.poll_render, future)
+            return
+        
+        if self.pending_render is None or self.pending_render[1] is not future:
+            return
+        params = self.pending_render[0]
+        self.pending_render = None
+        
+        try:
+            tag_image, display_image = future.result()
             
-            if self.current_image:
-                display_size = (400, 400)
-                display_image = self.current_image.copy()
-                display_image.thumbnail(display_size, Image.Resampling.LANCZOS)
+            if tag_image:
+                self.current_image = tag_image
+                self.preview_params = params
                 
                 self.photo = ImageTk.PhotoImage(display_image)
                 self.canvas.create_image(
@@ -328,6 +444,8 @@ class GPTagGeneratorGUI:
                     anchor=tk.CENTER
                 )
             else:
+                self.current_image = None
+                self.preview_params = None
                 messagebox.showerror("Error", "Failed to generate tag")
                 
         except Exception as e:
@@ -343,15 +461,19 @@ class GPTagGeneratorGUI:
         """
         Save the currently generated tag to a PNG file.
         
-        Generates filename using tag_id and handles save errors
-        with message dialogs.
+        Generates filename using the tag_id the current image was built
+        with and handles save errors with message dialogs.
         """
         if not self.current_image:
             messagebox.showwarning("Warning", "Generate a tag first!")
             return
+        if self.pending_render is not None:
+            messagebox.showwarning("Warning", "Tag generation in progress, try again once it finishes!")
+            return
             
         try:
-            filename = f"gptag_{self.tag_id.get()}.png"
+            tag_id = self.preview_params[8]
+            filename = f"gptag_{tag_id}.png"
             save_path = os.path.join(self.save_path.get(), filename)
             self.current_image.save(save_path)
             messagebox.showinfo("Success", f"Tag saved as {filename}")
@@ -364,6 +486,7 @@ def main():
     root = tk.Tk()
     app = GPTagGeneratorGUI(root)
     root.mainloop()
+    app.executor.shutdown(wait=False, cancel_futures=True)
 
 
 if __name__ == "__main__":
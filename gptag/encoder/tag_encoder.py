@@ -28,28 +28,25 @@ from PIL import Image, ImageDraw, ImageFont
 import reedsolo
 import os
 
-def create_fiducial_marker(latitude, longitude, altitude, quaternion, scale, accuracy, tag_id, version_id, U=10):
+def create_marker_base(U=10):
     """
-    Creates a GP-Tag fiducial marker encoding global positioning data.
+    Creates the payload-independent part of a GP-Tag marker.
+    
+    Draws everything that depends only on the base unit size: the outer ring,
+    spikes, annuli quadrants, finder patterns and timing patterns. The result
+    can be passed to create_fiducial_marker() as base_image so that repeated
+    tag generation at the same U only draws the data and ID cells.
     
     Args:
-        latitude (float): Latitude in degrees (-90 to +90)
-        longitude (float): Longitude in degrees (-180 to +180)
-        altitude (float): Altitude in meters (-10000 to +10000)
-        quaternion (list): Orientation as quaternion [qx, qy, qz, qw]
-        scale (float): Scale factor in cells/mm (0.0036 to 3.6)
-        accuracy (int): Accuracy level (0-3)
-        tag_id (int): Unique tag identifier (0-4095)
-        version_id (int): Version identifier (0-15)
-        U (int): Base unit size in pixels (default: 2)
+        U (int): Base unit size in pixels (default: 10)
     
     Returns:
-        PIL.Image: The generated GP-Tag image
+        PIL.Image: Marker image without data or ID cells
     """
     # Basic dimensions
     grid_size = 21  # 21x21 grid
     grid_diagonal = 15 * U
-    outer_annulus_outer_radius = math.floor(grid_diagonal + (3 * U))
+    outer_annulus_outer_radius = get_marker_radius(U)
     
     # Define image dimensions and origin
     image_size_x = 2 * outer_annulus_outer_radius
@@ -198,6 +195,62 @@ def create_fiducial_marker(latitude, longitude, altitude, quaternion, scale, acc
         grid[5, i] = 1 if i % 2 == 0 else 0  # horizontal
         grid[i, 5] = 1 if i % 2 == 0 else 0  # vertical
 
+    # Draw the finder and timing cells of the inner grid
+    grid_start_x = math.floor(origin_x - (grid_size * U) // 2)
+    grid_start_y = math.floor(origin_y - (grid_size * U) // 2)
+    draw = ImageDraw.Draw(img)
+
+    for x, y in get_reserved_modules(grid_size):
+        color = 'black' if grid[y, x] == 1 else 'white'  # Finder/timing patterns
+        draw.rectangle([
+            grid_start_x + x * U,
+            grid_start_y + y * U,
+            grid_start_x + (x + 1) * U - 1,
+            grid_start_y + (y + 1) * U - 1
+        ], fill=color)
+
+    return img
+
+
+def create_fiducial_marker(latitude, longitude, altitude, quaternion, scale, accuracy, tag_id, version_id, U=10,
+                           base_image=None):
+    """
+    Creates a GP-Tag fiducial marker encoding global positioning data.
+    
+    Args:
+        latitude (float): Latitude in degrees (-90 to +90)
+        longitude (float): Longitude in degrees (-180 to +180)
+        altitude (float): Altitude in meters (-10000 to +10000)
+        quaternion (list): Orientation as quaternion [qx, qy, qz, qw]
+        scale (float): Scale factor in cells/mm (0.0036 to 3.6)
+        accuracy (int): Accuracy level (0-3)
+        tag_id (int): Unique tag identifier (0-4095)
+        version_id (int): Version identifier (0-15)
+        U (int): Base unit size in pixels (default: 2)
+        base_image (PIL.Image, optional): Result of create_marker_base(U) to
+            draw the data onto. It is copied, not modified. Built on demand
+            if omitted.
+    
+    Returns:
+        PIL.Image: The generated GP-Tag image
+    
+    Raises:
+        ValueError: If base_image was not built for the same U
+    """
+    # Basic dimensions
+    grid_size = 21  # 21x21 grid
+    outer_annulus_outer_radius = get_marker_radius(U)
+    origin_x = outer_annulus_outer_radius
+    origin_y = outer_annulus_outer_radius
+
+    image_size = (2 * outer_annulus_outer_radius, 2 * outer_annulus_outer_radius)
+    if base_image is not None and base_image.size != image_size:
+        raise ValueError(f"base_image is {base_image.size[0]}x{base_image.size[1]}, "
+                         f"expected {image_size[0]}x{image_size[1]} for U={U}")
+
+    # Initialize grid for GP-Tag data
+    grid = np.ones((grid_size, grid_size), dtype=np.uint8)
+
     try:
         # Main data encoding
         lat_value = int((latitude + 90) * ((2**35 - 1) / 180))
@@ -238,11 +291,7 @@ def create_fiducial_marker(latitude, longitude, altitude, quaternion, scale, acc
     except ValueError as e:
         return None
 
-    reserved_modules = set()
-    for y in range(grid_size):
-        for x in range(grid_size):
-            if (x < 5 and y < 5) or (x < 5 and y > grid_size-6) or (x > grid_size-6 and y < 5) or (x > grid_size-6 and y > grid_size-6) or x == 5 or y == 5:
-                reserved_modules.add((x, y))
+    reserved_modules = get_reserved_modules(grid_size)
 
     bit_index = 0
     for x in range(grid_size - 1, -1, -1):
@@ -258,30 +307,26 @@ def create_fiducial_marker(latitude, longitude, altitude, quaternion, scale, acc
         if bit_index >= len(encoded_bits):
             break
 
-    # Draw the inner grid
+    # Finder/timing patterns and annuli come from the payload-independent base
+    if base_image is None:
+        base_image = create_marker_base(U)
+    img = base_image.copy()
+
+    # Draw the data cells of the inner grid
     grid_start_x = math.floor(origin_x - (grid_size * U) // 2)
     grid_start_y = math.floor(origin_y - (grid_size * U) // 2)
     draw = ImageDraw.Draw(img)
 
-    # Count available and used data cells
-    available_cells = 0
-    used_cells = 0
-    
-    # Regular encoding
     for y in range(grid_size):
         for x in range(grid_size):
             if (x, y) not in reserved_modules:
-                if used_cells < len(encoded_bits):
-                    color = 'black' if grid[y, x] == 1 else 'white'  # Actual data bits
-            else:
-                color = 'black' if grid[y, x] == 1 else 'white'  # Finder/timing patterns
-                
-            draw.rectangle([
-                grid_start_x + x * U,
-                grid_start_y + y * U,
-                grid_start_x + (x + 1) * U - 1,
-                grid_start_y + (y + 1) * U - 1
-            ], fill=color)
+                color = 'black' if grid[y, x] == 1 else 'white'  # Actual data bits
+                draw.rectangle([
+                    grid_start_x + x * U,
+                    grid_start_y + y * U,
+                    grid_start_x + (x + 1) * U - 1,
+                    grid_start_y + (y + 1) * U - 1
+                ], fill=color)
 
     # Draw the full 36x36 grid
     grid_size_for_start = 36
@@ -293,6 +338,37 @@ def create_fiducial_marker(latitude, longitude, altitude, quaternion, scale, acc
     return img
 
 
+def get_marker_radius(U):
+    """
+    Get the outer radius of a GP-Tag marker, which is also its origin offset.
+    
+    Args:
+        U (int): Base unit size in pixels
+    
+    Returns:
+        int: Radius in pixels; the marker image is twice this on each side
+    """
+    grid_diagonal = 15 * U
+    return math.floor(grid_diagonal + (3 * U))
+
+def get_reserved_modules(grid_size):
+    """
+    Get the inner grid cells occupied by finder and timing patterns.
+    
+    Args:
+        grid_size (int): Number of cells along one side of the inner grid
+    
+    Returns:
+        set: (x, y) cell coordinates that do not carry data bits
+    """
+    reserved_modules = set()
+    for y in range(grid_size):
+        for x in range(grid_size):
+            if (x < 5 and y < 5) or (x < 5 and y > grid_size-6) or (x > grid_size-6 and y < 5) or (x > grid_size-6 and y > grid_size-6) or x == 5 or y == 5:
+                reserved_modules.add((x, y))
+    return reserved_modules
+
+
 def fill_reserved_area(draw, full_grid_start_x, full_grid_start_y, U, id_encoded_bits):
     """
     Fill the reserved areas of the GP-Tag with encoded ID data.
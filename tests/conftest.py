@@ -0,0 +1,20 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+DECODER_DIR = Path(__file__).resolve().parents[1] / "gptag" / "decoder"
+sys.path.insert(0, str(DECODER_DIR))
+
+
+@pytest.fixture(scope="session")
+def demo_decoder():
+    """The GP-Tag_Demo_Decoder module, whose file name is not importable."""
+    name = "gp_tag_demo_decoder"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, DECODER_DIR / "GP-Tag_Demo_Decoder.py")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("scalar_tag", [False, True])
+def test_numba_and_numpy_paths_agree(demo_decoder, monkeypatch, scalar_tag):
+    pytest.importorskip("numba")
+    rng = np.random.default_rng(0)
+    count = 64
+    positions = rng.uniform(-50.0, 50.0, (count, 3))
+    if scalar_tag:
+        lats, lons, alts = 63.82, 20.31, 45.16
+    else:
+        lats = rng.uniform(-80.0, 80.0, count)
+        lons = rng.uniform(-180.0, 180.0, count)
+        alts = rng.uniform(0.0, 500.0, count)
+
+    compiled = demo_decoder.calculate_observer_positions(positions, lats, lons, alts)
+    monkeypatch.setattr(demo_decoder, "_get_observer_kernel", lambda: None)
+    vectorized = demo_decoder.calculate_observer_positions(positions, lats, lons, alts)
+
+    for got, expected in zip(compiled, vectorized):
+        assert got.shape == (count,)
+        np.testing.assert_allclose(got, expected, rtol=0, atol=1e-9)
+
+
+def test_batch_matches_single(demo_decoder):
+    rng = np.random.default_rng(1)
+    positions = rng.uniform(-50.0, 50.0, (8, 3))
+
+    lats, lons, alts = demo_decoder.calculate_observer_positions(positions, 63.82, 20.31, 45.16)
+
+    for i, position in enumerate(positions):
+        np.testing.assert_allclose(
+            (lats[i], lons[i], alts[i]),
+            demo_decoder.calculate_observer_position(position.tolist(), 63.82, 20.31, 45.16),
+            rtol=0, atol=1e-9)
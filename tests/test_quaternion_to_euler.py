@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+
+def test_single_and_batch_agree(demo_decoder):
+    rng = np.random.default_rng(0)
+    quats = rng.normal(size=(500, 4)) * rng.uniform(0.1, 5.0, (500, 1))
+    # Gimbal lock and 180 degree rotations, unit and non-unit
+    quats = np.vstack([quats, [
+        [0.707, 0, 0.707, 0], [0, 0.707, 0, 0.707], [0, -0.707, 0, 0.707],
+        [1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0.2, 0.4, 0.6, 1.8],
+    ]])
+
+    batch = demo_decoder.quaternion_to_euler_NED(quats)
+    single = np.array([demo_decoder.quaternion_to_euler_NED(q) for q in quats])
+
+    np.testing.assert_allclose(single, batch, atol=1e-9)
+
+
+@pytest.mark.parametrize("q, expected", [
+    ([0, 0, 0, 1], [0, 0, 0]),
+    ([1, 0, 0, 0], [180, 0, 0]),
+    ([0, 1, 0, 0], [180, 0, 180]),
+    ([0, 0, 1, 0], [0, 0, 180]),
+    ([0.707, 0, 0.707, 0], [0, 90, 180]),
+])
+def test_known_angles(demo_decoder, q, expected):
+    np.testing.assert_allclose(demo_decoder.quaternion_to_euler_NED(q), expected, atol=1e-9)
+    np.testing.assert_allclose(demo_decoder.quaternion_to_euler_NED(np.array([q]))[0], expected, atol=1e-9)
@@ -0,0 +1,49 @@
+import cv2
+import numpy as np
+import pytest
+
+from sift_detector import SIFTDetector6DoF
+
+
+def smooth_image(channels):
+    # Gradients stay below 32 grey levels per pixel, so the 1/32 pixel
+    # fixed-point rounding of the remap tables moves values by at most ~1
+    ys, xs = np.mgrid[0:480, 0:640]
+    planes = [127 + 100 * np.sin(xs / (8.0 + c)) * np.cos(ys / (8.0 + c)) for c in range(channels)]
+    return np.dstack(planes).squeeze().round().astype(np.uint8)
+
+
+@pytest.mark.parametrize("channels", [1, 3])
+def test_rectify_matches_warp_perspective(channels):
+    image = smooth_image(channels)
+    # Every output pixel samples inside the source, away from the border
+    H = np.array([[1.1, 0.05, -20.0], [0.02, 0.9, -15.0], [1e-4, 2e-4, 1.0]])
+    detector = SIFTDetector6DoF()
+
+    rectified = detector.rectify(image, H, (300, 200))
+
+    expected = cv2.warpPerspective(image, H, (300, 200))
+    assert rectified.shape == expected.shape
+    diff = np.abs(rectified.astype(np.int16) - expected.astype(np.int16))
+    assert diff.max() <= 1
+
+
+def test_rectify_cache_is_bounded():
+    image = np.zeros((120, 160), dtype=np.uint8)
+    detector = SIFTDetector6DoF()
+    homographies = [np.array([[1.0, 0.0, float(i)], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+                    for i in range(SIFTDetector6DoF.MAX_CACHED_MAPS + 3)]
+
+    for H in homographies:
+        detector.rectify(image, H, (80, 60))
+
+    cached = detector._rectification_maps
+    assert len(cached) == SIFTDetector6DoF.MAX_CACHED_MAPS
+    # The oldest entries are evicted first
+    assert (homographies[0].tobytes(), (80, 60)) not in cached
+    assert (homographies[-1].tobytes(), (80, 60)) in cached
+
+    # A cached homography reuses its tables
+    maps = cached[(homographies[-1].tobytes(), (80, 60))]
+    detector.rectify(image, homographies[-1], (80, 60))
+    assert cached[(homographies[-1].tobytes(), (80, 60))] is maps
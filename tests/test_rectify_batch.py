@@ -0,0 +1,23 @@
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "gptag" / "decoder"))
+
+from sift_detector import rectify_batch
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 4, 5])
+def test_rectify_batch_matches_per_frame_warp(count):
+    rng = np.random.default_rng(count)
+    frames = [rng.integers(0, 256, (480, 640), dtype=np.uint8) for _ in range(count)]
+    H = np.array([[1.1, 0.05, 3.0], [0.02, 0.9, 5.0], [1e-4, 2e-4, 1.0]])
+
+    rectified = rectify_batch(frames, H, (300, 200))
+
+    expected = np.stack([cv2.warpPerspective(frame, H, (300, 200)) for frame in frames])
+    assert rectified.shape == (count, 200, 300)
+    np.testing.assert_array_equal(rectified, expected)